@@ -1,151 +1,162 @@
 #!/usr/bin/env python3
 """
 NV10 Parallel Mode Controller pentru Raspberry Pi
-Versiune: 1.1 - Fixed GPIO edge detection
+Versiune: 1.2 - pigpio/lgpio edge callbacks (fără polling)
 """
 
-import RPi.GPIO as GPIO
 import time
-from datetime import datetime
 import threading
 import signal
 import sys
 
-# ============================================
-# CONFIGURARE PINI GPIO
-# ============================================
-VEND1_PIN = 17  # GPIO 17 (Pin 11 fizic) - Canal 1
-VEND2_PIN = 27  # GPIO 27 (Pin 13 fizic) - Canal 2
-VEND3_PIN = 22  # GPIO 22 (Pin 15 fizic) - Canal 3
-VEND4_PIN = 23  # GPIO 23 (Pin 16 fizic) - Canal 4
-BUSY_PIN = 24   # GPIO 24 (Pin 18 fizic) - Busy (opțional)
+from nv10_core import (
+    VEND1_PIN, VEND2_PIN, VEND3_PIN, VEND4_PIN, BUSY_PIN, VEND_PINS, PIN_INDEX,
+    CHANNEL_VALUES, PULSE_NONE, PULSE_VALID,
+    EdgeDetector, BillStats, show_bill_accepted, print_stats, reset_stats,
+    display, start_display, stop_display
+)
+
+# pigpio (daemon pigpiod) e preferat; lgpio (/dev/gpiochip) e fallback
+try:
+    import pigpio
+except ImportError:
+    pigpio = None
+
+try:
+    import lgpio
+except ImportError:
+    lgpio = None
 
 # ============================================
-# VALORI BANCNOTE (RON)
+# CONFIGURARE GPIO
 # ============================================
-CHANNEL_VALUES = {
-    1: 1,    # Canal 1 = 1 RON
-    2: 5,    # Canal 2 = 5 RON
-    3: 10,   # Canal 3 = 10 RON
-    4: 50    # Canal 4 = 50 RON
-}
+# Pinii și valorile canalelor sunt în nv10_core.py
+GPIOCHIP = 0    # /dev/gpiochip0 (folosit doar de lgpio)
 
 # ============================================
 # PARAMETRI DETECTARE PULS
 # ============================================
-PULSE_MIN_TIME = 0.050  # 50ms
-PULSE_MAX_TIME = 0.500  # 500ms
-DEBOUNCE_TIME = 0.100   # 100ms
-POLL_INTERVAL = 0.001   # 1ms pentru polling
+# Valori în nanosecunde (întregi, fără conversii float)
+PULSE_MIN_NS = 50000000       # 50ms
+PULSE_MAX_NS = 500000000      # 500ms
+PULSE_TIMEOUT_NS = 1000000000  # Peste 1s = timeout
+GLITCH_FILTER_US = 50   # Filtru pigpio - ignoră nivelurile stabile < 50µs
+WATCHDOG_LEVEL = 2      # Nivel raportat de watchdog (pigpio.TIMEOUT / lgpio.TIMEOUT)
 
 # ============================================
 # VARIABILE GLOBALE
 # ============================================
-total_bills = 0
-total_amount = 0
-channel_counts = {1: 0, 2: 0, 3: 0, 4: 0}
-bill_history = []
-running = True
-
-# Lock pentru thread-safety
-stats_lock = threading.Lock()
+stats = BillStats()
+shutdown_event = threading.Event()  # Setat la oprire (q / Ctrl+C)
 
 class NV10Controller:
     """Controller pentru NV10 în modul Parallel"""
     
     def __init__(self):
-        self.last_pulse_time = {1: 0, 2: 0, 3: 0, 4: 0}
-        self.last_state = {1: GPIO.HIGH, 2: GPIO.HIGH, 3: GPIO.HIGH, 4: GPIO.HIGH}
-        self.setup_gpio()
+        self.pi = None
+        self.chip = None
         
-    def setup_gpio(self):
-        """Configurare pini GPIO"""
-        # Cleanup GPIO existent
-        GPIO.cleanup()
+        if pigpio is not None:
+            pi = pigpio.pi()
+            if pi.connected:
+                self.pi = pi
+            else:
+                pi.stop()
         
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
+        if self.pi is None:
+            if lgpio is None:
+                raise RuntimeError("pigpiod nu rulează (sudo systemctl start pigpiod) și lgpio nu e instalat")
+            self.chip = lgpio.gpiochip_open(GPIOCHIP)
         
-        # Configurare pini ca INPUT cu PULL-UP
-        GPIO.setup(VEND1_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-        GPIO.setup(VEND2_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-        GPIO.setup(VEND3_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-        GPIO.setup(VEND4_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-        GPIO.setup(BUSY_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        self.detector = EdgeDetector(PULSE_MIN_NS, PULSE_MAX_NS, PULSE_TIMEOUT_NS)
+        self.last_tick = 0
+        self.tick_wraps = 0
+        self.callbacks = []
+        self.setup_gpio()
         
-        print("✓ GPIO configurat\n")
+    @property
+    def backend(self):
+        """Numele bibliotecii GPIO folosite"""
+        return 'pigpio' if self.pi is not None else 'lgpio'
     
-    def check_channel(self, channel, pin):
-        """Verifică un canal pentru pulsuri (polling method)"""
-        global total_bills, total_amount, channel_counts, bill_history
-        
-        current_state = GPIO.input(pin)
-        
-        # Detectează falling edge (HIGH -> LOW)
-        if current_state == GPIO.LOW and self.last_state[channel] == GPIO.HIGH:
-            current_time = time.time()
-            
-            # Verifică debounce
-            if current_time - self.last_pulse_time[channel] < DEBOUNCE_TIME:
-                self.last_state[channel] = current_state
-                return
-            
-            # Măsoară durata pulsului
-            pulse_start = time.time()
-            
-            # Așteaptă să revină la HIGH
-            timeout = pulse_start + PULSE_MAX_TIME * 2
-            while GPIO.input(pin) == GPIO.LOW and time.time() < timeout:
-                time.sleep(0.001)
-            
-            pulse_duration = time.time() - pulse_start
+    def setup_gpio(self):
+        """Configurare pini GPIO"""
+        if self.pi is not None:
+            # Configurare pini ca INPUT cu PULL-UP
+            for pin in (VEND1_PIN, VEND2_PIN, VEND3_PIN, VEND4_PIN, BUSY_PIN):
+                self.pi.set_mode(pin, pigpio.INPUT)
+                self.pi.set_pull_up_down(pin, pigpio.PUD_UP)
             
-            # Verifică dacă pulsul e valid
-            if PULSE_MIN_TIME <= pulse_duration <= PULSE_MAX_TIME:
-                value = CHANNEL_VALUES[channel]
-                
-                # Actualizează statistici (thread-safe)
-                with stats_lock:
-                    total_bills += 1
-                    total_amount += value
-                    channel_counts[channel] += 1
-                    bill_history.append({
-                        'time': datetime.now(),
-                        'channel': channel,
-                        'value': value,
-                        'pulse_duration': pulse_duration
-                    })
-                
-                # Afișează mesaj
-                self.display_bill_accepted(channel, value, pulse_duration)
-                
-                self.last_pulse_time[channel] = current_time
+            # Debounce hardware (DMA sampling) pe canalele VEND
+            for pin in VEND_PINS:
+                self.pi.set_glitch_filter(pin, GLITCH_FILTER_US)
+        else:
+            # Canalele VEND primesc fronturi cu timestamp din kernel
+            for pin in VEND_PINS:
+                lgpio.gpio_claim_alert(self.chip, pin, lgpio.BOTH_EDGES, lgpio.SET_PULL_UP)
+                lgpio.gpio_set_debounce_micros(self.chip, pin, GLITCH_FILTER_US)
+            lgpio.gpio_claim_input(self.chip, BUSY_PIN, lgpio.SET_PULL_UP)
+        
+        print(f"✓ GPIO configurat ({self.backend})\n")
+    
+    def start(self):
+        """Înregistrează callback-urile pentru toate canalele"""
+        for pin in VEND_PINS:
+            if self.pi is not None:
+                self.callbacks.append(self.pi.callback(pin, pigpio.EITHER_EDGE, self._on_edge_pigpio))
             else:
-                print(f"⚠ Puls invalid pe canal {channel}: {pulse_duration*1000:.0f}ms")
+                self.callbacks.append(lgpio.callback(self.chip, pin, lgpio.BOTH_EDGES, self._on_edge_lgpio))
+    
+    def _on_edge_pigpio(self, gpio, level, tick):
+        """Callback pigpio - apelat pe fiecare front, cu tick în µs"""
+        # Tick-ul pigpio are 32 biți și se reia de la 0 la ~72 minute;
+        # callback-urile vin în ordine, deci o scădere înseamnă o reluare
+        if tick < self.last_tick:
+            self.tick_wraps += 1
+        self.last_tick = tick
+        
+        self.on_edge(PIN_INDEX[gpio], level, ((self.tick_wraps << 32) + tick) * 1000)
+    
+    def _on_edge_lgpio(self, chip, gpio, level, timestamp):
+        """Callback lgpio - apelat pe fiecare front, cu timestamp kernel în ns"""
+        self.on_edge(PIN_INDEX[gpio], level, timestamp)
+    
+    def set_watchdog(self, index, armed):
+        """Pornește/oprește watchdog-ul canalului index (0 = oprit)"""
+        pin = VEND_PINS[index]
+        if self.pi is not None:
+            self.pi.set_watchdog(pin, PULSE_TIMEOUT_NS // 1000000 if armed else 0)
+        else:
+            lgpio.gpio_set_watchdog_micros(self.chip, pin, PULSE_TIMEOUT_NS // 1000 if armed else 0)
+    
+    def on_edge(self, index, level, ts_ns):
+        """Un front pe canalul index - decizia o ia EdgeDetector"""
+        if level == WATCHDOG_LEVEL:
+            # Niciun front de PULSE_TIMEOUT_NS - închide pulsul rămas LOW
+            self.set_watchdog(index, False)
+            status, pulse_ns = self.detector.check_timeout(index, ts_ns)
+        else:
+            # Watchdog doar cât pinul e LOW - în repaus nu trezește nimic
+            self.set_watchdog(index, level == 0)
+            status, pulse_ns = self.detector.on_edge(index, level, ts_ns)
         
-        self.last_state[channel] = current_state
+        if status == PULSE_VALID:
+            self.process_bill(index + 1, pulse_ns)
+        elif status != PULSE_NONE:
+            display(f"⚠ Puls invalid pe canal {index + 1}: {pulse_ns // 1000000}ms\n")
     
-    def poll_channels(self):
-        """Polling continuu pentru toate canalele"""
-        while running:
-            self.check_channel(1, VEND1_PIN)
-            self.check_channel(2, VEND2_PIN)
-            self.check_channel(3, VEND3_PIN)
-            self.check_channel(4, VEND4_PIN)
-            time.sleep(POLL_INTERVAL)
+    def process_bill(self, channel, pulse_ns):
+        """Înregistrează și afișează o bancnotă acceptată"""
+        # Rulează pe thread-ul de callback pigpio/lgpio; lock-ul e în BillStats
+        value = CHANNEL_VALUES[channel - 1]
+        stats.record(channel, value, pulse_ns)
+        show_bill_accepted(channel, value, pulse_ns, stats.total_amount)
     
-    def display_bill_accepted(self, channel, value, pulse_duration):
-        """Afișează mesaj pentru bancnotă acceptată"""
-        print()
-        print("╔════════════════════════════════════════╗")
-        print("║  ✓✓✓ BANCNOTĂ ACCEPTATĂ! ✓✓✓          ║")
-        print(f"║  Canal: {channel}                                 ║")
-        print(f"║  Valoare: {value} RON{' ' * (28 - len(str(value)))}║")
-        print(f"║  Puls: {pulse_duration*1000:.0f}ms{' ' * (31 - len(str(int(pulse_duration*1000))))}║")
-        print("╚════════════════════════════════════════╝")
-        print()
-        print(f"Total sesiune: {total_amount} RON")
-        print()
+    def read_pin(self, pin):
+        """Citește nivelul unui pin (0/1)"""
+        if self.pi is not None:
+            return self.pi.read(pin)
+        return lgpio.gpio_read(self.chip, pin)
     
     def get_connection_status(self):
         """Verifică statusul conexiunilor"""
@@ -159,21 +170,31 @@ class NV10Controller:
         
         status = {}
         for name, pin in pins.items():
-            state = GPIO.input(pin)
-            status[name] = 'HIGH (idle)' if state == GPIO.HIGH else 'LOW (activ?)'
+            state = self.read_pin(pin)
+            status[name] = 'HIGH (idle)' if state == 1 else 'LOW (activ?)'
         
         return status
     
     def cleanup(self):
         """Curățare GPIO la oprire"""
-        GPIO.cleanup()
+        for cb in self.callbacks:
+            cb.cancel()
+        self.callbacks = []
+        
+        if self.pi is not None:
+            for pin in VEND_PINS:
+                self.pi.set_glitch_filter(pin, 0)
+                self.pi.set_watchdog(pin, 0)
+            self.pi.stop()
+        else:
+            lgpio.gpiochip_close(self.chip)
 
 def print_header():
     """Afișează header-ul aplicației"""
     print()
     print("╔════════════════════════════════════════╗")
     print("║  NV10 Controller - Raspberry Pi       ║")
-    print("║  Parallel Mode - Version 1.1          ║")
+    print("║  Parallel Mode - Version 1.2          ║")
     print("╚════════════════════════════════════════╝")
     print()
 
@@ -185,52 +206,6 @@ def print_connection_status(controller):
         print(f"  {name}: {state}")
     print()
 
-def print_stats():
-    """Afișează statistici detaliate"""
-    with stats_lock:
-        print()
-        print("════════════════════════════════════════")
-        print("  STATISTICI SESIUNE")
-        print("════════════════════════════════════════")
-        print(f"Total bancnote: {total_bills} buc")
-        print(f"Total valoare: {total_amount} RON")
-        
-        if total_bills > 0:
-            print(f"Medie/bancnotă: {total_amount / total_bills:.2f} RON")
-        
-        print()
-        print("Detalii pe canal:")
-        for channel in sorted(channel_counts.keys()):
-            count = channel_counts[channel]
-            if count > 0:
-                value = CHANNEL_VALUES[channel]
-                print(f"  Canal {channel} ({value} RON): {count} buc = {count * value} RON")
-        
-        # Ultimele 10 bancnote
-        if bill_history:
-            print()
-            print("Ultimele 10 bancnote:")
-            for bill in bill_history[-10:][::-1]:
-                timestamp = bill['time'].strftime('%H:%M:%S')
-                print(f"  [{timestamp}] Canal {bill['channel']}: {bill['value']} RON")
-        
-        print("════════════════════════════════════════")
-        print()
-
-def reset_stats():
-    """Resetează statisticile"""
-    global total_bills, total_amount, channel_counts, bill_history
-    
-    with stats_lock:
-        total_bills = 0
-        total_amount = 0
-        channel_counts = {1: 0, 2: 0, 3: 0, 4: 0}
-        bill_history = []
-    
-    print()
-    print("✓ Statistici resetate")
-    print()
-
 def print_help():
     """Afișează comenzile disponibile"""
     print()
@@ -247,25 +222,23 @@ def print_help():
 
 def command_thread():
     """Thread pentru comenzi de la tastatură"""
-    global running
-    
     print("Tastează 'h' pentru help\n")
     
-    while running:
+    while not shutdown_event.is_set():
         try:
             cmd = input().strip().lower()
             
             if cmd == 's':
-                print_stats()
+                print_stats(stats)
             elif cmd == 'r':
-                reset_stats()
+                reset_stats(stats)
             elif cmd == 'c':
                 print_connection_status(controller)
             elif cmd == 'h':
                 print_help()
             elif cmd == 'q':
                 print("\nOprire...")
-                running = False
+                shutdown_event.set()
                 break
             elif cmd:
                 print("✗ Comandă necunoscută. Tastează 'h' pentru help.")
@@ -273,26 +246,19 @@ def command_thread():
         except EOFError:
             break
         except KeyboardInterrupt:
-            running = False
+            shutdown_event.set()
             break
 
 def signal_handler(sig, frame):
     """Handler pentru Ctrl+C"""
-    global running
     print("\n\nOprire prin Ctrl+C...")
-    running = False
+    shutdown_event.set()
 
 def status_thread():
     """Thread pentru afișare status periodic"""
-    last_status = time.time()
-    
-    while running:
-        if time.time() - last_status > 60:  # La 60 secunde
-            with stats_lock:
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] Alive | Total: {total_amount} RON ({total_bills} bancnote)")
-            last_status = time.time()
-        
-        time.sleep(1)
+    # wait() întoarce True doar la oprire - altfel la fiecare 60 secunde
+    while not shutdown_event.wait(timeout=60):
+        print(f"[{time.strftime('%H:%M:%S')}] Alive | Total: {stats.total_amount} RON ({stats.total_bills} bancnote)")
 
 # ============================================
 # MAIN
@@ -307,14 +273,18 @@ if __name__ == "__main__":
     
     # Inițializare controller
     print("Inițializare GPIO...")
-    controller = NV10Controller()
+    try:
+        controller = NV10Controller()
+    except RuntimeError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
     
     # Afișează configurație
     print("Configurare pini (BCM numbering):")
-    print(f"  Canal 1: GPIO {VEND1_PIN} = {CHANNEL_VALUES[1]} RON")
-    print(f"  Canal 2: GPIO {VEND2_PIN} = {CHANNEL_VALUES[2]} RON")
-    print(f"  Canal 3: GPIO {VEND3_PIN} = {CHANNEL_VALUES[3]} RON")
-    print(f"  Canal 4: GPIO {VEND4_PIN} = {CHANNEL_VALUES[4]} RON")
+    print(f"  Canal 1: GPIO {VEND1_PIN} = {CHANNEL_VALUES[0]} RON")
+    print(f"  Canal 2: GPIO {VEND2_PIN} = {CHANNEL_VALUES[1]} RON")
+    print(f"  Canal 3: GPIO {VEND3_PIN} = {CHANNEL_VALUES[2]} RON")
+    print(f"  Canal 4: GPIO {VEND4_PIN} = {CHANNEL_VALUES[3]} RON")
     print(f"  Busy: GPIO {BUSY_PIN}")
     print()
     
@@ -333,9 +303,9 @@ if __name__ == "__main__":
     print("Introdu o bancnotă pentru test...")
     print()
     
-    # Pornește thread-uri
-    poll_thread = threading.Thread(target=controller.poll_channels, daemon=True)
-    poll_thread.start()
+    # Pornește afișarea, detectarea (callback-uri pigpio) și thread-urile
+    start_display()
+    controller.start()
     
     cmd_thread = threading.Thread(target=command_thread, daemon=True)
     cmd_thread.start()
@@ -343,22 +313,21 @@ if __name__ == "__main__":
     stat_thread = threading.Thread(target=status_thread, daemon=True)
     stat_thread.start()
     
-    # Loop principal
+    # Așteaptă oprirea (fără polling)
     try:
-        while running:
-            time.sleep(0.1)
+        shutdown_event.wait()
     
     except KeyboardInterrupt:
         pass
     
     finally:
         # Cleanup
-        running = False
-        time.sleep(0.5)  # Așteaptă thread-urile să termine
+        shutdown_event.set()
         
         print("\nCurățare GPIO...")
         controller.cleanup()
+        stop_display()
         print("✓ GPIO cleanup complet")
         print("\nStatistici finale:")
-        print_stats()
+        print_stats(stats)
         print("La revedere!")
\ No newline at end of file
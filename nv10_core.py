@@ -0,0 +1,311 @@
+"""
+============================================
+NV10 - cod comun pentru Pulse.py și parallel.py
+Detectare puls, statistici și afișare
+============================================
+"""
+
+import queue
+import sys
+import threading
+import time
+from array import array
+from collections import deque
+from itertools import islice
+
+# ============================================
+# CONFIGURARE PINI GPIO (BCM numbering)
+# ============================================
+VEND1_PIN = 17  # GPIO 17 (Pin 11 fizic) - Canal 1
+VEND2_PIN = 27  # GPIO 27 (Pin 13 fizic) - Canal 2
+VEND3_PIN = 22  # GPIO 22 (Pin 15 fizic) - Canal 3
+VEND4_PIN = 23  # GPIO 23 (Pin 16 fizic) - Canal 4
+BUSY_PIN = 24   # GPIO 24 (Pin 18 fizic) - Busy (opțional)
+
+VEND_PINS = (VEND1_PIN, VEND2_PIN, VEND3_PIN, VEND4_PIN)
+
+# Mapare inversă GPIO -> index canal (pentru callback-uri)
+PIN_INDEX = {pin: index for index, pin in enumerate(VEND_PINS)}
+
+# ============================================
+# VALORI BANCNOTE (RON)
+# ============================================
+# Indexate după canal - 1
+CHANNEL_VALUES = (
+    1,    # Canal 1 = 1 RON
+    5,    # Canal 2 = 5 RON
+    10,   # Canal 3 = 10 RON
+    50    # Canal 4 = 50 RON
+)
+
+# ============================================
+# REZULTAT DETECTARE PULS
+# ============================================
+PULSE_NONE = 0       # Nimic de raportat (start puls sau front ignorat)
+PULSE_VALID = 1      # Bancnotă acceptată
+PULSE_SHORT = 2      # Prea scurt
+PULSE_LONG = 3       # Prea lung
+PULSE_TIMED_OUT = 4  # Pinul a rămas LOW peste timeout
+
+HISTORY_SIZE = 1024  # Ultimele N bancnote păstrate în istoric
+
+# ============================================
+# AFIȘARE
+# ============================================
+BOX_WIDTH = 40
+BOX_TOP = "╔" + "═" * BOX_WIDTH + "╗"
+BOX_BOTTOM = "╚" + "═" * BOX_WIDTH + "╝"
+LINE = "═" * BOX_WIDTH
+
+
+# (secundă, "HH:MM:SS") - un singur tuplu, înlocuit atomic
+_hms_cache = (None, "")
+
+
+def timestamp_ms():
+    """Ora curentă HH:MM:SS.mmm - fără obiect datetime și fără float"""
+    global _hms_cache
+    ns = time.time_ns()
+    second = ns // 1000000000
+    cached_second, hms = _hms_cache
+    if second != cached_second:
+        # localtime/strftime doar o dată pe secundă
+        hms = time.strftime('%H:%M:%S', time.localtime(second))
+        _hms_cache = (second, hms)
+    return f"{hms}.{ns // 1000000 % 1000:03d}"
+
+
+# Un rând din chenar, completat la BOX_WIDTH caractere - șablonul e
+# construit o singură dată, la import
+box_row = ("║{:<%d}║\n" % BOX_WIDTH).format
+
+
+# Partea constantă a mesajului de bancnotă acceptată
+BILL_BOX_HEAD = "\n" + BOX_TOP + "\n" + box_row("  ✓✓✓ BANCNOTĂ ACCEPTATĂ! ✓✓✓")
+
+
+class EdgeDetector:
+    """Mașina de stări pentru cele 4 canale - doar decizie, fără I/O
+
+    Primește fronturi cu timestamp în ns (orice ceas monoton, același
+    pentru toate apelurile) și întoarce (status, pulse_ns).
+    """
+
+    def __init__(self, pulse_min_ns, pulse_max_ns, timeout_ns, debounce_ns=0):
+        self.pulse_min_ns = pulse_min_ns
+        self.pulse_max_ns = pulse_max_ns
+        self.timeout_ns = timeout_ns
+        self.debounce_ns = debounce_ns
+        self.pulse_start_ns = [None, None, None, None]
+        self.last_pulse_ns = [None, None, None, None]
+
+    def on_edge(self, index, level, ts_ns):
+        """Procesează un front pe canalul index (0-3); level 0 = LOW, 1 = HIGH"""
+        if level == 0:
+            # Falling edge (HIGH -> LOW) = start puls, cu debounce
+            last = self.last_pulse_ns[index]
+            if self.debounce_ns and last is not None and ts_ns - last <= self.debounce_ns:
+                return PULSE_NONE, 0
+            self.pulse_start_ns[index] = ts_ns
+            return PULSE_NONE, 0
+
+        start = self.pulse_start_ns[index]
+        if level != 1 or start is None:
+            return PULSE_NONE, 0
+
+        # Rising edge (LOW -> HIGH) = sfârșit puls
+        self.pulse_start_ns[index] = None
+        pulse_ns = ts_ns - start
+
+        if pulse_ns < self.pulse_min_ns:
+            return PULSE_SHORT, pulse_ns
+        if pulse_ns >= self.timeout_ns:
+            return PULSE_TIMED_OUT, pulse_ns
+        if pulse_ns > self.pulse_max_ns:
+            return PULSE_LONG, pulse_ns
+
+        self.last_pulse_ns[index] = ts_ns
+        return PULSE_VALID, pulse_ns
+
+    def next_deadline_ns(self):
+        """Momentul la care expiră cel mai vechi puls în curs (None = niciunul)"""
+        starts = [start for start in self.pulse_start_ns if start is not None]
+        if not starts:
+            return None
+        return min(starts) + self.timeout_ns
+
+    def check_timeout(self, index, now_ns):
+        """Închide un puls care nu s-a terminat în timeout_ns"""
+        start = self.pulse_start_ns[index]
+        if start is None or now_ns - start < self.timeout_ns:
+            return PULSE_NONE, 0
+
+        self.pulse_start_ns[index] = None
+        return PULSE_TIMED_OUT, now_ns - start
+
+
+class BillStats:
+    """Statistici sesiune + istoric bancnote
+
+    record() rulează pe thread-ul de detectare, reset() pe cel de comenzi -
+    amândouă sub același lock (fără concurență reală: bancnotele vin la
+    secunde distanță). Afișarea copiază contoarele fără lock.
+    """
+
+    # Contoare: [total bancnote, total valoare, canal 1, canal 2, canal 3, canal 4]
+    BILLS = 0
+    AMOUNT = 1
+    CHANNEL = 2
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        self.counters = array('Q', [0, 0, 0, 0, 0, 0])
+        self.lock = threading.Lock()
+        self.history = deque(maxlen=history_size)  # Ring buffer - memorie fixă
+
+    @property
+    def total_bills(self):
+        return self.counters[self.BILLS]
+
+    @property
+    def total_amount(self):
+        return self.counters[self.AMOUNT]
+
+    def record(self, channel, value, pulse_ns):
+        """Înregistrează o bancnotă acceptată"""
+        counters = self.counters
+        with self.lock:
+            counters[self.BILLS] += 1
+            counters[self.AMOUNT] += value
+            counters[self.CHANNEL + channel - 1] += 1
+
+            # Înregistrare: (ts_ns, canal, valoare, pulse_ns) - formatată doar la afișare
+            self.history.append((time.time_ns(), channel, value, pulse_ns))
+
+    def snapshot(self):
+        """Copie consistentă a contoarelor: (bancnote, valoare, [contor canal])"""
+        bills, amount, *counts = self.counters.tolist()
+        return bills, amount, counts
+
+    def last_bills(self, count=10):
+        """Ultimele bancnote, cea mai recentă prima (list() copiază atomic)"""
+        return list(islice(reversed(self.history), count))
+
+    def reset(self):
+        """Resetează contoarele și istoricul"""
+        # Sub lock - un reset între cele trei += din record() ar lăsa
+        # totalurile și contoarele pe canal în dezacord
+        with self.lock:
+            self.counters[:] = array('Q', [0] * len(self.counters))
+            self.history.clear()
+
+
+# Coada de afișare - thread-ul de detectare doar pune mesaje, nu scrie în terminal
+display_q = queue.SimpleQueue()
+_display_thread = None
+
+
+def display(text):
+    """Pune un text în coada de afișare (nu blochează)"""
+    display_q.put_nowait(('text', text))
+
+
+def show_bill_accepted(channel, value, pulse_ns, total_amount):
+    """Trimite bancnota acceptată spre afișare - un singur put_nowait"""
+    display_q.put_nowait(('bill', channel, value, pulse_ns, total_amount, time.time()))
+
+
+def _render_bill(channel, value, pulse_ns, total_amount, ts):
+    """Textul mesajului pentru bancnotă acceptată"""
+    timestamp = time.strftime("%H:%M:%S", time.localtime(ts))
+    return (
+        BILL_BOX_HEAD
+        + box_row(f"  Canal: {channel}")
+        + box_row(f"  Valoare: {value} RON")
+        + box_row(f"  Durata puls: {pulse_ns / 1000000:.1f} ms")
+        + box_row(f"  Ora: {timestamp}")
+        + BOX_BOTTOM
+        + f"\n\nTotal sesiune: {total_amount} RON\n\n"
+    )
+
+
+def _display_worker():
+    """Consumă coada de afișare până la mesajul None"""
+    write = sys.stdout.write
+    running = True
+    while running:
+        msg = display_q.get()
+        
+        # Adună tot ce s-a strâns în coadă - un singur write + flush per rafală
+        parts = []
+        while msg is not None:
+            parts.append(_render_bill(*msg[1:]) if msg[0] == 'bill' else msg[1])
+            try:
+                msg = display_q.get_nowait()
+            except queue.Empty:
+                break
+        else:
+            running = False
+        
+        if parts:
+            write("".join(parts))
+            sys.stdout.flush()
+
+
+def start_display():
+    """Pornește thread-ul de afișare"""
+    global _display_thread
+    _display_thread = threading.Thread(target=_display_worker, daemon=True)
+    _display_thread.start()
+
+
+def stop_display(timeout=1.0):
+    """Golește coada de afișare și oprește thread-ul"""
+    if _display_thread is not None:
+        display_q.put_nowait(None)
+        _display_thread.join(timeout)
+
+
+def print_stats(stats, channel_values=CHANNEL_VALUES):
+    """Afișează statisticile sesiunii - un singur write"""
+    bills, amount, counts = stats.snapshot()
+    
+    rows = [
+        "",
+        LINE,
+        "  STATISTICI SESIUNE",
+        LINE,
+        f"Total bancnote: {bills} buc",
+        f"Total valoare: {amount} RON",
+    ]
+    
+    if bills > 0:
+        rows.append(f"Medie/bancnotă: {amount / bills:.2f} RON")
+        rows.append("")
+        rows.append("Detalii pe canal:")
+        for channel, (count, value) in enumerate(zip(counts, channel_values), 1):
+            if count > 0:
+                rows.append(f"  • Canal {channel} ({value} RON): {count} buc = {count * value} RON")
+    else:
+        rows.append("")
+        rows.append("  Nicio bancnotă procesată încă")
+    
+    last_bills = stats.last_bills(10)
+    if last_bills:
+        rows.append("")
+        rows.append("Ultimele 10 bancnote:")
+        for ts_ns, channel, value, _ in last_bills:
+            timestamp = time.strftime('%H:%M:%S', time.localtime(ts_ns // 1000000000))
+            rows.append(f"  [{timestamp}] Canal {channel}: {value} RON")
+    
+    rows.append(LINE)
+    sys.stdout.write("\n".join(rows) + "\n\n")
+    sys.stdout.flush()
+
+
+def reset_stats(stats):
+    """Resetează statisticile"""
+    stats.reset()
+
+    print()
+    print("✓ Statistici resetate")
+    print()
@@ -9,38 +9,66 @@ VERSIUNE cu suport pentru DIVIZOR DE TENSIUNE
 import RPi.GPIO as GPIO
 import time
 import threading
-from datetime import datetime
+import mmap
+import os
+import queue
+import re
+import select
+import signal
+import sys
+
+from nv10_core import (
+    VEND1_PIN, VEND2_PIN, VEND3_PIN, VEND4_PIN, BUSY_PIN, VEND_PINS, PIN_INDEX,
+    PULSE_NONE, PULSE_VALID, PULSE_SHORT, PULSE_TIMED_OUT,
+    EdgeDetector, BillStats, show_bill_accepted, print_stats, reset_stats,
+    display, start_display, stop_display, timestamp_ms
+)
+import nv10_core
+
+# libgpiod dă fronturi cu timestamp din kernel; fără el - GPIO.add_event_detect
+try:
+    import gpiod
+except ImportError:
+    gpiod = None
 
 # ============================================
 # CONFIGURARE PINI GPIO (BCM numbering)
 # ============================================
-VEND1_PIN = 17  # Canal 1 - GPIO 17
-VEND2_PIN = 27  # Canal 2 - GPIO 27
-VEND3_PIN = 22  # Canal 3 - GPIO 22
-VEND4_PIN = 23  # Canal 4 - GPIO 23
-BUSY_PIN = 24   # Busy (opțional) - GPIO 24
+# Pinii canalelor sunt în nv10_core.py
+VEND_MASK = (1 << VEND1_PIN) | (1 << VEND2_PIN) | (1 << VEND3_PIN) | (1 << VEND4_PIN)
 
-# Valori bancnote pentru fiecare canal (RON)
-CHANNEL_VALUES = [1, 5, 10, 50]  # Canal 1-4
+# Evenimente de front din kernel (libgpiod)
+GPIOCHIP = 'gpiochip0'
+
+# Citire în bloc a nivelurilor (registrul GPLEV0 = GPIO 0-31)
+GPIOMEM_PATH = '/dev/gpiomem'
+GPLEV0_OFFSET = 0x34
+
+# Valori bancnote pentru fiecare canal (RON) - modificabile cu v1=10
+CHANNEL_VALUES = list(nv10_core.CHANNEL_VALUES)  # Canal 1-4
 
 # PARAMETRI pentru detectare pulsuri - AJUSTAȚI PENTRU DIVIZOR
-DEBOUNCE_TIME = 0.050      # 50ms debounce (mai scurt!)
-PULSE_MIN_TIME = 0.030     # Acceptă pulsuri de la 30ms (mai flexibil!)
-PULSE_MAX_TIME = 0.600     # Până la 600ms
-PULSE_TIMEOUT = 0.700      # Timeout maxim
+# Valori în nanosecunde (întregi, comparate cu time.monotonic_ns())
+DEBOUNCE_NS = 50000000        # 50ms debounce (mai scurt!)
+PULSE_MIN_NS = 30000000       # Acceptă pulsuri de la 30ms (mai flexibil!)
+PULSE_MAX_NS = 600000000      # Până la 600ms
+PULSE_TIMEOUT_NS = 700000000  # Timeout maxim
+EVENT_WAIT = 1.0           # s - cât așteaptă epoll când niciun puls nu e în curs
 
 # Mod debug - afișează TOATE schimbările de nivel
 DEBUG_MODE = True
 
-# Variabile globale
-last_pulse_time = [0, 0, 0, 0]
-total_bills = 0
-total_amount = 0
-channel_count = [0, 0, 0, 0]
-running = True
+# Comandă setare valoare: v1=5
+VALUE_CMD = re.compile(r'^v([1-4])=(\d+)$')
 
-# Lock pentru thread-safety
-stats_lock = threading.Lock()
+# Variabile globale
+detector = EdgeDetector(PULSE_MIN_NS, PULSE_MAX_NS, PULSE_TIMEOUT_NS, DEBOUNCE_NS)
+stats = BillStats()
+shutdown_event = threading.Event()  # Setat la oprire (q)
+gplev0 = None  # View pe registrul GPLEV0 (None = fallback GPIO.input)
+edge_lines = None  # (chip, linii) libgpiod cerute în setup_gpio (None = fallback RPi.GPIO)
+edge_count = [0, 0, 0, 0]  # Fronturi per canal (pentru debug)
+gpio_edges = queue.SimpleQueue()  # Fronturi de la RPi.GPIO (fallback fără libgpiod)
 
 
 def print_header():
@@ -53,29 +81,106 @@ def print_header():
     print()
 
 
+def open_gpiomem():
+    """Mapează registrele GPIO pentru citirea tuturor pinilor dintr-o dată"""
+    global gplev0
+    
+    try:
+        fd = os.open(GPIOMEM_PATH, os.O_RDWR | os.O_SYNC)
+        try:
+            mem = mmap.mmap(fd, 4096, mmap.MAP_SHARED, mmap.PROT_READ)
+        finally:
+            os.close(fd)
+    except OSError:
+        gplev0 = None
+        return False
+    
+    gplev0 = memoryview(mem).cast('I')
+    return True
+
+
+def read_levels():
+    """Nivelurile GPIO 0-31 într-un singur cuvânt (bit N = GPIO N)"""
+    if gplev0 is not None:
+        return gplev0[GPLEV0_OFFSET // 4]
+    
+    # Fallback: citire pin cu pin
+    levels = 0
+    for pin in VEND_PINS + (BUSY_PIN,):
+        if GPIO.input(pin):
+            levels |= 1 << pin
+    return levels
+
+
+def request_edge_lines():
+    """Cere de la kernel fronturile pinilor VEND (libgpiod) - (chip, linii)"""
+    chip = gpiod.Chip(GPIOCHIP)
+    try:
+        lines = chip.get_lines(list(VEND_PINS))
+        lines.request(consumer='nv10', type=gpiod.LINE_REQ_EV_BOTH_EDGES)
+    except OSError:
+        chip.close()
+        raise
+    return chip, lines
+
+
+def on_gpio_edge(pin):
+    """Callback RPi.GPIO - doar pune frontul în coadă, decizia rămâne în watch thread"""
+    gpio_edges.put_nowait((PIN_INDEX[pin], GPIO.input(pin) == GPIO.LOW, time.monotonic_ns()))
+
+
+def add_edge_detect():
+    """Fallback fără libgpiod - fronturi prin GPIO.add_event_detect (epoll în RPi.GPIO)"""
+    # Fără bouncetime - ar înghiți frontul de sfârșit al pulsurilor scurte;
+    # debounce-ul îl face EdgeDetector
+    for pin in VEND_PINS:
+        GPIO.add_event_detect(pin, GPIO.BOTH, callback=on_gpio_edge)
+
+
 def setup_gpio():
     """Configurează pinii GPIO"""
+    global edge_lines
+    
     GPIO.setmode(GPIO.BCM)
     GPIO.setwarnings(False)
     
     # ✅ FĂRĂ pull-up intern - divizorul face pull-up extern
-    GPIO.setup(VEND1_PIN, GPIO.IN, pull_up_down=GPIO.PUD_OFF)
-    GPIO.setup(VEND2_PIN, GPIO.IN, pull_up_down=GPIO.PUD_OFF)
-    GPIO.setup(VEND3_PIN, GPIO.IN, pull_up_down=GPIO.PUD_OFF)
-    GPIO.setup(VEND4_PIN, GPIO.IN, pull_up_down=GPIO.PUD_OFF)
-    GPIO.setup(BUSY_PIN, GPIO.IN, pull_up_down=GPIO.PUD_OFF)
+    GPIO.setup(list(VEND_PINS) + [BUSY_PIN], GPIO.IN, pull_up_down=GPIO.PUD_OFF)
     
     print("✓ GPIO configurat (BCM mode)")
     print("✓ Pini INPUT fără pull-up intern (divizor extern activ)")
+    if open_gpiomem():
+        print(f"✓ Citire în bloc din {GPIOMEM_PATH}")
+    else:
+        print(f"⚠️  {GPIOMEM_PATH} indisponibil - citire pin cu pin")
+    
+    # Liniile se cer aici, pe main thread - o eroare (linie ocupată, chip
+    # lipsă) trece pe fallback în loc să oprească thread-ul de detectare
+    if gpiod is None:
+        print("⚠️  libgpiod indisponibil - GPIO.add_event_detect")
+    else:
+        try:
+            edge_lines = request_edge_lines()
+            print("✓ Fronturi din kernel (libgpiod)")
+        except OSError as e:
+            print(f"⚠️  libgpiod indisponibil ({e}) - GPIO.add_event_detect")
+    
+    if edge_lines is None:
+        try:
+            add_edge_detect()
+        except RuntimeError as e:
+            # Fără nicio sursă de fronturi nu are rost să pornim
+            print(f"❌ Detectare fronturi imposibilă: {e}")
+            sys.exit(1)
     print()
 
 
 def print_settings():
     """Afișează setările de detectare"""
     print("Setări detectare puls:")
-    print(f"  Minim: {PULSE_MIN_TIME * 1000:.0f} ms")
-    print(f"  Maxim: {PULSE_MAX_TIME * 1000:.0f} ms")
-    print(f"  Timeout: {PULSE_TIMEOUT * 1000:.0f} ms")
+    print(f"  Minim: {PULSE_MIN_NS // 1000000} ms")
+    print(f"  Maxim: {PULSE_MAX_NS // 1000000} ms")
+    print(f"  Timeout: {PULSE_TIMEOUT_NS // 1000000} ms")
     print(f"  Debug mode: {'ON ✓' if DEBUG_MODE else 'OFF'}")
     print()
 
@@ -84,15 +189,15 @@ def print_connection_status():
     """Verifică și afișează starea conexiunilor"""
     print("Status conexiuni:")
     
-    pins = [VEND1_PIN, VEND2_PIN, VEND3_PIN, VEND4_PIN]
     pin_names = ["VEND1", "VEND2", "VEND3", "VEND4"]
+    levels = read_levels()
     
-    for i, (pin, name) in enumerate(zip(pins, pin_names)):
-        state = GPIO.input(pin)
+    for i, (pin, name) in enumerate(zip(VEND_PINS, pin_names)):
+        state = (levels >> pin) & 1
         status = "HIGH ✓" if state else "LOW ⚠️"
         print(f"  Canal {i+1} ({name}, GPIO {pin}): {status}")
     
-    busy_state = GPIO.input(BUSY_PIN)
+    busy_state = (levels >> BUSY_PIN) & 1
     busy_status = "HIGH ✓" if busy_state else "LOW"
     print(f"  Busy (GPIO {BUSY_PIN}): {busy_status}")
     print()
@@ -114,170 +219,154 @@ def test_pins_realtime():
         (BUSY_PIN, "BSY")
     ]
     
+    # Toți pinii testați într-un singur cuvânt (bit N = GPIO N)
+    test_mask = VEND_MASK | (1 << BUSY_PIN)
+    
     # Memorează starea anterioară
-    prev_states = [GPIO.input(pin) for pin, _ in pins]
+    prev = read_levels() & test_mask
     
     try:
-        counter = 0
+        next_status_ns = time.monotonic_ns()
         while True:
-            current_states = [GPIO.input(pin) for pin, _ in pins]
+            current = read_levels() & test_mask
             
-            # Verifică dacă s-a schimbat ceva
-            changed = False
-            for i, (current, prev) in enumerate(zip(current_states, prev_states)):
-                if current != prev:
-                    changed = True
-                    pin, name = pins[i]
-                    transition = "HIGH→LOW" if prev and not current else "LOW→HIGH"
-                    timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                    print(f"[{timestamp}] {name} (GPIO {pin}): {transition}")
+            # Verifică dacă s-a schimbat ceva - un singur XOR
+            changed = current ^ prev
+            if changed:
+                timestamp = timestamp_ms()
+                for pin, name in pins:
+                    if changed >> pin & 1:
+                        transition = "LOW→HIGH" if current >> pin & 1 else "HIGH→LOW"
+                        print(f"[{timestamp}] {name} (GPIO {pin}): {transition}")
             
-            # Afișează starea curentă periodic
-            if counter % 100 == 0:  # La fiecare secundă
+            # Afișează starea curentă periodic - după ceasul monoton, nu după
+            # numărul de iterații (o iterație durează mai mult de 10ms)
+            now = time.monotonic_ns()
+            if now >= next_status_ns:  # La fiecare secundă
+                next_status_ns = now + 1000000000
                 states_str = []
-                for i, (pin, name) in enumerate(pins):
-                    state = "HIGH" if current_states[i] else "LOW "
+                for pin, name in pins:
+                    state = "HIGH" if current >> pin & 1 else "LOW "
                     states_str.append(f"{name}:{state}")
                 
                 print(f"\r[Status] {' | '.join(states_str)}", end='', flush=True)
             
-            prev_states = current_states
-            counter += 1
+            prev = current
             time.sleep(0.01)  # 100Hz
             
     except KeyboardInterrupt:
         print("\n\n✓ Test oprit\n")
 
 
-def process_bill(channel, value, pulse_width):
+def process_bill(channel, value, pulse_ns):
     """Procesează o bancnotă acceptată"""
-    global total_bills, total_amount, channel_count
-    
-    with stats_lock:
-        total_bills += 1
-        total_amount += value
-        channel_count[channel - 1] += 1
-    
-    # Afișează mesaj mare
-    print()
-    print("╔════════════════════════════════════════╗")
-    print("║  ✓✓✓ BANCNOTĂ ACCEPTATĂ! ✓✓✓          ║")
-    print(f"║  Canal: {channel}                                 ║")
-    
-    value_str = f"  Valoare: {value} RON"
-    padding = 40 - len(value_str)
-    print(f"║{value_str}{' ' * padding}║")
+    # Rulează pe thread-ul watch_channels; lock-ul e în BillStats
+    stats.record(channel, value, pulse_ns)
+    show_bill_accepted(channel, value, pulse_ns, stats.total_amount)
+
+
+def report_pulse(channel, status, pulse_ns):
+    """Afișează rezultatul unui puls și procesează bancnota dacă e valid"""
+    if status == PULSE_VALID:
+        result = " → VALID ✓"
+    elif status == PULSE_SHORT:
+        result = " → Prea scurt ✗"
+    elif status == PULSE_TIMED_OUT:
+        result = " → Timeout ✗"
+    else:
+        result = " → Prea lung ✗"
     
-    pulse_str = f"  Durata puls: {pulse_width:.1f} ms"
-    padding = 40 - len(pulse_str)
-    print(f"║{pulse_str}{' ' * padding}║")
+    # Debug - afișează ORICE puls (prin coada de afișare)
+    timestamp = timestamp_ms()
+    display(f"[{timestamp}] Canal {channel} - Puls: {pulse_ns / 1000000:.1f} ms{result}\n")
     
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    time_str = f"  Ora: {timestamp}"
-    padding = 40 - len(time_str)
-    print(f"║{time_str}{' ' * padding}║")
+    if status == PULSE_VALID:
+        value = CHANNEL_VALUES[channel - 1]
+        process_bill(channel, value, pulse_ns)
+
+
+def handle_edge(channel_index, falling, now):
+    """Un front pe canalul channel_index (0-3) cu timestamp monoton în ns"""
+    # Detectează orice schimbare (pentru debug)
+    if DEBUG_MODE:
+        edge_count[channel_index] += 1
+        if edge_count[channel_index] % 10 == 0:  # Nu spam-ui consola
+            transition = "HIGH→LOW" if falling else "LOW→HIGH"
+            display(f"[Debug] Canal {channel_index + 1}: {transition}\n")
     
-    print("╚════════════════════════════════════════╝")
-    print()
-    print(f"Total sesiune: {total_amount} RON")
-    print()
+    status, pulse_ns = detector.on_edge(channel_index, 0 if falling else 1, now)
+    if status != PULSE_NONE:
+        report_pulse(channel_index + 1, status, pulse_ns)
 
 
-def check_channel(channel, pin):
-    """Verifică un canal pentru pulsuri - VERSIUNE ÎMBUNĂTĂȚITĂ"""
-    global last_pulse_time
-    
-    channel_index = channel - 1
-    last_state = GPIO.input(pin)
-    edge_count = 0
-    
-    while running:
-        current_state = GPIO.input(pin)
-        
-        # Detectează orice schimbare (pentru debug)
-        if DEBUG_MODE and current_state != last_state:
-            edge_count += 1
-            if edge_count % 10 == 0:  # Nu spam-ui consola
-                transition = "HIGH→LOW" if last_state else "LOW→HIGH"
-                print(f"[Debug] Canal {channel}: {transition}")
-        
-        # Detectează falling edge (HIGH -> LOW) = start puls
-        if current_state == GPIO.LOW and last_state == GPIO.HIGH:
-            current_time = time.time()
-            
-            # Verifică debounce
-            if (current_time - last_pulse_time[channel_index]) > DEBOUNCE_TIME:
-                
-                pulse_start = time.time()
-                
-                # Măsoară durata pulsului cu precizie mare
-                while GPIO.input(pin) == GPIO.LOW and \
-                      (time.time() - pulse_start) < PULSE_TIMEOUT:
-                    time.sleep(0.00001)  # 10 microsecunde!
-                
-                pulse_width = (time.time() - pulse_start) * 1000  # ms
-                
-                # Debug - afișează ORICE puls
-                timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                print(f"[{timestamp}] Canal {channel} - Puls: {pulse_width:.1f} ms", end="")
-                
-                # Verifică dacă pulsul e valid
-                if PULSE_MIN_TIME * 1000 <= pulse_width <= PULSE_MAX_TIME * 1000:
-                    print(" → VALID ✓")
-                    value = CHANNEL_VALUES[channel_index]
-                    process_bill(channel, value, pulse_width)
-                    last_pulse_time[channel_index] = time.time()
-                    
-                elif pulse_width < PULSE_MIN_TIME * 1000:
-                    print(" → Prea scurt ✗")
-                    
-                elif pulse_width >= PULSE_TIMEOUT * 1000:
-                    print(" → Timeout ✗")
-                    
-                else:
-                    print(" → Prea lung ✗")
-        
-        last_state = current_state
-        time.sleep(0.0001)  # 0.1ms - foarte rapid!
+def check_timeouts():
+    """Închide pulsurile rămase LOW peste PULSE_TIMEOUT_NS"""
+    now = time.monotonic_ns()
+    for channel_index in range(4):
+        status, pulse_ns = detector.check_timeout(channel_index, now)
+        if status != PULSE_NONE:
+            report_pulse(channel_index + 1, status, pulse_ns)
 
 
-def print_stats():
-    """Afișează statisticile sesiunii"""
-    print()
-    print("════════════════════════════════════════")
-    print("  STATISTICI SESIUNE")
-    print("════════════════════════════════════════")
-    print(f"Total bancnote: {total_bills} buc")
-    print(f"Total valoare: {total_amount} RON")
-    print()
+def wait_timeout():
+    """Cât poate bloca așteptarea (s) - până expiră primul puls în curs"""
+    deadline = detector.next_deadline_ns()
+    if deadline is None:
+        return EVENT_WAIT
+    return max(0, deadline - time.monotonic_ns()) / 1e9
+
+
+def watch_channels():
+    """Un singur thread pentru toate canalele - așteaptă fronturile în kernel"""
+    if edge_lines is None:
+        watch_channels_rpigpio()
+        return
     
-    if total_bills > 0:
-        print("Detalii pe canal:")
-        for i in range(4):
-            if channel_count[i] > 0:
-                value = CHANNEL_VALUES[i]
-                count = channel_count[i]
-                total = count * value
-                print(f"  • Canal {i+1} ({value} RON): {count} buc = {total} RON")
-    else:
-        print("  Nicio bancnotă procesată încă")
+    chip, lines = edge_lines
     
-    print("════════════════════════════════════════")
-    print()
+    # epoll pe FD-ul de evenimente al fiecărei linii; fd -> (index canal, linie)
+    epoll = select.epoll()
+    fd_lines = {}
+    for channel_index, line in enumerate(lines.to_list()):
+        fd = line.event_get_fd()
+        epoll.register(fd, select.EPOLLIN)
+        fd_lines[fd] = (channel_index, line)
+    
+    try:
+        while not shutdown_event.is_set():
+            for fd, _ in epoll.poll(wait_timeout()):
+                channel_index, line = fd_lines[fd]
+                
+                # Toate fronturile din buffer-ul kernel într-un singur read()
+                for event in line.event_read_multiple():
+                    falling = event.type == gpiod.LineEvent.FALLING_EDGE
+                    # Timestamp din kernel (CLOCK_MONOTONIC, ca time.monotonic_ns())
+                    handle_edge(channel_index, falling, event.sec * 1000000000 + event.nsec)
+            
+            check_timeouts()
+    
+    finally:
+        epoll.close()
+        lines.release()
+        chip.close()
 
 
-def reset_stats():
-    """Resetează statisticile"""
-    global total_bills, total_amount, channel_count
-    
-    with stats_lock:
-        total_bills = 0
-        total_amount = 0
-        channel_count = [0, 0, 0, 0]
+def watch_channels_rpigpio():
+    """Fronturile puse în coadă de on_gpio_edge (callback-uri adăugate în setup_gpio)"""
+    try:
+        while not shutdown_event.is_set():
+            try:
+                channel_index, falling, now = gpio_edges.get(timeout=wait_timeout())
+            except queue.Empty:
+                pass
+            else:
+                handle_edge(channel_index, falling, now)
+            
+            check_timeouts()
     
-    print()
-    print("✓ Statistici resetate")
-    print()
+    finally:
+        for pin in VEND_PINS:
+            GPIO.remove_event_detect(pin)
 
 
 def set_channel_value(channel, value):
@@ -318,16 +407,14 @@ def print_help():
 
 def command_listener():
     """Thread pentru comenzi de la tastatură"""
-    global running, CHANNEL_VALUES
-    
-    while running:
+    while not shutdown_event.is_set():
         try:
             cmd = input().strip().lower()
             
             if cmd == 'r':
-                reset_stats()
+                reset_stats(stats)
             elif cmd == 's':
-                print_stats()
+                print_stats(stats, CHANNEL_VALUES)
             elif cmd == 'c':
                 print_connection_status()
             elif cmd == 't':
@@ -338,16 +425,11 @@ def command_listener():
                 print_help()
             elif cmd == 'q':
                 print("\nÎnchidere aplicație...")
-                running = False
+                shutdown_event.set()
+            elif (match := VALUE_CMD.match(cmd)):
+                set_channel_value(int(match[1]), int(match[2]))
             elif cmd.startswith('v'):
-                # Comandă setare valoare: v1=5
-                try:
-                    parts = cmd.split('=')
-                    channel = int(parts[0][1:])
-                    value = int(parts[1])
-                    set_channel_value(channel, value)
-                except:
-                    print("✗ Format invalid. Exemplu: v1=10")
+                print("✗ Format invalid. Exemplu: v1=10")
             elif cmd:
                 print("✗ Comandă necunoscută. Tastează 'h' pentru help.")
                 
@@ -357,9 +439,15 @@ def command_listener():
             print(f"Eroare: {e}")
 
 
+def signal_handler(sig, frame):
+    """Handler pentru Ctrl+C - trezește main thread-ul"""
+    print("\n\nÎntrerupere de la tastatură (Ctrl+C)")
+    shutdown_event.set()
+
+
 def main():
     """Funcția principală"""
-    global running
+    signal.signal(signal.SIGINT, signal_handler)
     
     try:
         print_header()
@@ -384,39 +472,21 @@ def main():
         print("Introdu o bancnotă...")
         print()
         
-        # Pornește thread-uri pentru fiecare canal
-        threads = []
-        channels_data = [
-            (1, VEND1_PIN),
-            (2, VEND2_PIN),
-            (3, VEND3_PIN),
-            (4, VEND4_PIN)
-        ]
-        
-        for channel, pin in channels_data:
-            t = threading.Thread(target=check_channel, args=(channel, pin), daemon=True)
-            t.start()
-            threads.append(t)
+        # Pornește afișarea și un singur thread pentru toate canalele
+        start_display()
+        watch_thread = threading.Thread(target=watch_channels, daemon=True)
+        watch_thread.start()
         
         # Pornește thread pentru comenzi
         cmd_thread = threading.Thread(target=command_listener, daemon=True)
         cmd_thread.start()
         
-        # Statistici periodice (opțional, la 60 secunde)
-        # last_stats_time = time.time()
-        
-        while running:
-            time.sleep(1)
-            
-            # Dezactivat - doar dacă vrei statistici automate
-            # if time.time() - last_stats_time > 60:
-            #     print_stats()
-            #     last_stats_time = time.time()
-        
-    except KeyboardInterrupt:
-        print("\n\nÎntrerupere de la tastatură (Ctrl+C)")
+        # Main thread-ul doarme până la oprire (fără polling)
+        shutdown_event.wait()
     
     finally:
+        shutdown_event.set()
+        stop_display()
         print("\nCurățare GPIO...")
         GPIO.cleanup()
         print("✓ Aplicație închisă")
@@ -9,20 +9,75 @@ Cu retry logic pentru Arduino reset
 
 import serial
 import serial.tools.list_ports
-import json
+import glob
 import time
-import threading
-from datetime import datetime
 import sys
 import os
+import re
+import select
+import signal
+import threading
+
+# orjson e mai rapid dacă e instalat; acceptă direct bytes, ca și json.loads
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    json_loads = orjson.loads
+    
+    def json_dumps(data):
+        """orjson.dumps întoarce bytes - text pentru afișare"""
+        return orjson.dumps(data).decode('utf-8')
+else:
+    from json import loads as json_loads, dumps as json_dumps
 
 # ════════════════════════════════════════════
 # CONFIGURARE
 # ════════════════════════════════════════════
 BAUD_RATE = 115200
-running = True
+shutdown_event = threading.Event()  # Setat la oprire (quit / SIGTERM)
+stdin_open = True  # False după EOF pe stdin (ex. rulare ca serviciu)
+STDIN_FD = sys.stdin.fileno()
 RETRY_ATTEMPTS = 5
 RETRY_DELAY = 2
+RESET_WAIT = 3.0  # s - cât așteaptă maxim mesajul "ready" după reset Arduino
+FINAL_WAIT = 0.5  # s - cât așteaptă maxim statisticile finale la oprire
+MAX_LINE = 4096  # Octeți - o linie mai lungă e zgomot și e aruncată
+READ_WAIT = 0.5  # s - cât așteaptă epoll date de la Arduino (apoi verifică oprirea)
+READ_CHUNK = 4096  # Octeți - cât citește maxim un os.read() din portul serial
+
+# Symlink-uri udev stabile - căutate înainte de scanarea tuturor porturilor
+SERIAL_BY_ID = '/dev/serial/by-id'
+BY_ID_PATTERNS = (
+    'usb-Arduino*',              # Arduino original
+    'usb-1a86_*',                # CH340 / CH341
+    'usb-Silicon_Labs_CP210*',   # CP2102
+    'usb-FTDI_*',                # FTDI
+)
+
+# Scanarea completă (fallback): întâi după VID, apoi după descriere
+USB_VIDS = frozenset((
+    0x2341,  # Arduino
+    0x1A86,  # CH340 / CH341
+    0x10C4,  # CP2102
+    0x0403,  # FTDI
+))
+USB_DESCRIPTION = re.compile(r'arduino|ch34[01]|cp2102|ftdi|acm|usb serial', re.IGNORECASE)
+
+# Chenar mesaje
+BOX_WIDTH = 52
+BOX_LINE = "═" * BOX_WIDTH
+RULE = "═" * (BOX_WIDTH + 2)  # Linie separator, cât chenarul cu margini
+
+# Un rând din chenar, completat la BOX_WIDTH caractere - șablonul e
+# construit o singură dată, la import
+box_row = ("║{:<%d}║\n" % BOX_WIDTH).format
+
+# Rând care începe cu un emoji lat (2 coloane pe ecran, dar len() = 1) -
+# completat cu un caracter mai puțin, ca marginea din dreapta să se alinieze
+emoji_row = ("║{:<%d}║\n" % (BOX_WIDTH - 1)).format
 
 # ════════════════════════════════════════════
 # FUNCȚII HELPER
@@ -33,33 +88,43 @@ def find_arduino(show_details=True):
     if show_details:
         print("🔍 Căutare Arduino pe USB...")
     
-    ports = serial.tools.list_ports.comports()
-    
-    # Caută Arduino specific (idVendor=2341 pentru Arduino original)
-    for port in ports:
-        # Check by VID:PID
-        if port.vid == 0x2341:  # Arduino VID
+    # Direct după numele udev - fără să citească sysfs pentru fiecare port
+    for pattern in BY_ID_PATTERNS:
+        candidates = sorted(glob.glob(os.path.join(SERIAL_BY_ID, pattern)))
+        if candidates:
+            port = os.path.realpath(candidates[0])
             if show_details:
-                print(f"✓ Arduino găsit: {port.device}")
-                print(f"  Descriere: {port.description}")
-                print(f"  Serial: {port.serial_number}")
-            return port.device
-        
-        # Fallback: check by description
-        description = port.description.lower()
-        if any(keyword in description for keyword in 
-               ['arduino', 'ch340', 'ch341', 'cp2102', 'ftdi', 'acm']):
-            if show_details:
-                print(f"✓ Dispozitiv găsit: {port.device}")
-                print(f"  Descriere: {port.description}")
-            return port.device
+                print(f"✓ Arduino găsit: {port}")
+                print(f"  ID: {os.path.basename(candidates[0])}")
+            return port
+    
+    # Fallback: scanare completă (dispozitive neobișnuite) - comports() o
+    # singură dată, apoi ambele căutări pe aceeași listă
+    ports = list(serial.tools.list_ports.comports())
+    
+    # Întâi după VID - determinist, fără potrivire de text
+    port = next((p for p in ports if p.vid in USB_VIDS), None)
+    if port is not None:
+        if show_details:
+            print(f"✓ Arduino găsit: {port.device}")
+            print(f"  Descriere: {port.description}")
+            print(f"  Serial: {port.serial_number}")
+        return port.device
+    
+    # Apoi după descriere
+    port = next((p for p in ports if USB_DESCRIPTION.search(p.description or '')), None)
+    if port is not None:
+        if show_details:
+            print(f"✓ Dispozitiv găsit: {port.device}")
+            print(f"  Descriere: {port.description}")
+        return port.device
     
     return None
 
 
 def wait_for_arduino(max_wait=10):
     """Așteaptă ca Arduino să apară (după reset)"""
-    print(f"⏳ Așteptare Arduino (max {max_wait}s)...")
+    print(f"⏳ Așteptare Arduino (max {max_wait}s)...", flush=True)
     
     for i in range(max_wait):
         port = find_arduino(show_details=False)
@@ -68,20 +133,77 @@ def wait_for_arduino(max_wait=10):
             return port
         
         # Progress indicator
-        print(f"   {i+1}/{max_wait}s...", end='\r')
+        print(f"   {i+1}/{max_wait}s...", end='\r', flush=True)
         time.sleep(1)
     
     print()
     return None
 
 
+def wait_for_message(ser, accept, timeout):
+    """Procesează liniile primite până la un mesaj JSON acceptat de accept(data)
+    
+    Întoarce True dacă mesajul a venit în cel mult timeout secunde.
+    """
+    deadline = time.monotonic() + timeout
+    read_timeout = ser.timeout
+    ser.timeout = 0.05  # read() scurt - deadline-ul e respectat
+    buffer = bytearray()  # Bytes primiți după ultimul '\n'
+    found = False
+    
+    try:
+        while not found and time.monotonic() < deadline:
+            # Tot ce a sosit deja, sau cel puțin un octet (max 50 ms)
+            buffer += ser.read(ser.in_waiting or 1)
+            
+            # Doar linii complete - o linie prinsă între două citiri nu e
+            # tăiată în două
+            while (newline := buffer.find(b'\n')) >= 0:
+                line = bytes(buffer[:newline]).strip()
+                del buffer[:newline + 1]
+                if line:
+                    data = handle_line(line)
+                    if data is not None and accept(data):
+                        found = True
+            
+            if len(buffer) > MAX_LINE:
+                # Fără '\n' de prea mult timp (baud greșit / zgomot)
+                buffer.clear()
+        return found
+    
+    finally:
+        ser.timeout = read_timeout
+
+
+def is_ready(data):
+    """Mesajul trimis de Arduino după reset"""
+    return data.get('status') == 'ready'
+
+
+def is_statistics(data):
+    """Răspunsul la STATUS (și bill_accepted are total_bills)"""
+    return data.get('status') == 'ok' and 'total_bills' in data
+
+
+def open_port(port):
+    """Deschide portul serial cu lock exclusiv, fără flow control"""
+    settings = dict(timeout=1, write_timeout=1, xonxoff=False, rtscts=False)
+    try:
+        # flock(LOCK_EX) - lock advisory: o a doua instanță a monitorului nu
+        # poate deschide portul, dar un `cat /dev/ttyACM0` tot poate
+        return serial.Serial(port, BAUD_RATE, exclusive=True, **settings)
+    except (TypeError, ValueError):
+        # pyserial < 3.3 nu cunoaște exclusive= (3.0-3.2 aruncă ValueError)
+        return serial.Serial(port, BAUD_RATE, **settings)
+
+
 def connect_to_arduino(port, retry=True):
     """Conectează la Arduino cu retry logic"""
     
     for attempt in range(RETRY_ATTEMPTS if retry else 1):
         try:
             if attempt > 0:
-                print(f"\n🔄 Încercare {attempt + 1}/{RETRY_ATTEMPTS}...")
+                print(f"\n🔄 Încercare {attempt + 1}/{RETRY_ATTEMPTS}...", flush=True)
                 time.sleep(RETRY_DELAY)
                 
                 # Re-check dacă portul există
@@ -94,11 +216,12 @@ def connect_to_arduino(port, retry=True):
                         continue
             
             print(f"🔌 Conectare la {port}...")
-            ser = serial.Serial(port, BAUD_RATE, timeout=1)
+            ser = open_port(port)
             print("✓ Port deschis!")
             
-            print("⏳ Așteptare reset Arduino (3 secunde)...")
-            time.sleep(3)  # Arduino se resetează când se deschide serial
+            # Arduino se resetează când se deschide serial
+            print(f"⏳ Așteptare reset Arduino (max {RESET_WAIT:.0f} secunde)...", flush=True)
+            wait_for_message(ser, is_ready, RESET_WAIT)
             
             # Verifică că portul încă funcționează
             if ser.is_open:
@@ -117,15 +240,35 @@ def connect_to_arduino(port, retry=True):
     return None
 
 
+# Textele fixe de pornire - construite o singură dată, la import
+HEADER = (
+    "\n╔" + BOX_LINE + "╗\n"
+    + box_row("        NV10 Bill Acceptor Monitor")
+    + box_row("        Raspberry Pi + Arduino (USB)")
+    + box_row("        With Auto-Reconnect")
+    + "╚" + BOX_LINE + "╝\n\n"
+)
+READY_BANNER = (
+    "\n" + RULE + "\n"
+    + "  ✅ SISTEM GATA!\n"
+    + RULE + "\n\n"
+    + "👉 Introdu o bancnotă în NV10...\n\n"
+)
+
+
 def print_header():
-    """Header aplicație"""
-    print()
-    print("╔════════════════════════════════════════════════════╗")
-    print("║        NV10 Bill Acceptor Monitor                 ║")
-    print("║        Raspberry Pi + Arduino (USB)               ║")
-    print("║        With Auto-Reconnect                        ║")
-    print("╚════════════════════════════════════════════════════╝")
-    print()
+    """Header aplicație - un singur write"""
+    sys.stdout.write(HEADER)
+
+
+# Părțile constante ale mesajului de bancnotă acceptată
+BILL_BOX_HEAD = (
+    "\n╔" + BOX_LINE + "╗\n"
+    + box_row("          ✓✓✓ BANCNOTĂ ACCEPTATĂ! ✓✓✓")
+    + "╠" + BOX_LINE + "╣\n"
+)
+BILL_BOX_SEP = "╠" + BOX_LINE + "╣\n"
+BILL_BOX_BOTTOM = "╚" + BOX_LINE + "╝\n\n"
 
 
 def print_bill_accepted(data):
@@ -136,101 +279,193 @@ def print_bill_accepted(data):
     total_bills = data.get('total_bills', 0)
     total_amount = data.get('total_amount', 0)
     
-    timestamp = datetime.now().strftime("%H:%M:%S")
+    timestamp = time.strftime("%H:%M:%S")
     
-    print()
-    print("╔════════════════════════════════════════════════════╗")
-    print("║          ✓✓✓ BANCNOTĂ ACCEPTATĂ! ✓✓✓              ║")
-    print("╠════════════════════════════════════════════════════╣")
-    print(f"║  ⏰ Ora:        {timestamp}                           ║")
-    print(f"║  📍 Canal:      {channel}                                  ║")
-    print(f"║  💵 Valoare:    {value} RON                              ║")
-    print(f"║  ⚡ Puls:       {pulse_ms} ms                              ║")
-    print("╠════════════════════════════════════════════════════╣")
-    print(f"║  📊 Total bancnote: {total_bills} buc                          ║")
-    print(f"║  💰 Total valoare:  {total_amount} RON                          ║")
-    print("╚════════════════════════════════════════════════════╝")
-    print()
+    # Un singur write - rândurile sunt completate de emoji_row
+    sys.stdout.write(
+        BILL_BOX_HEAD
+        + emoji_row(f"  ⏰ Ora:        {timestamp}")
+        + emoji_row(f"  📍 Canal:      {channel}")
+        + emoji_row(f"  💵 Valoare:    {value} RON")
+        + emoji_row(f"  ⚡ Puls:       {pulse_ms} ms")
+        + BILL_BOX_SEP
+        + emoji_row(f"  📊 Total bancnote: {total_bills} buc")
+        + emoji_row(f"  💰 Total valoare:  {total_amount} RON")
+        + BILL_BOX_BOTTOM
+    )
+    sys.stdout.flush()
+
+
+# Părțile constante ale statisticilor
+STATS_HEAD = "\n" + RULE + "\n  📊 STATISTICI SESIUNE\n" + RULE + "\n"
+STATS_BOTTOM = RULE + "\n\n"
 
 
 def print_statistics(data):
-    """Afișează statistici"""
-    print()
-    print("═" * 54)
-    print("  📊 STATISTICI SESIUNE")
-    print("═" * 54)
-    print(f"  Total bancnote: {data.get('total_bills', 0)} buc")
-    print(f"  Total valoare:  {data.get('total_amount', 0)} RON")
+    """Afișează statistici - un singur write"""
+    parts = [
+        STATS_HEAD,
+        f"  Total bancnote: {data.get('total_bills', 0)} buc\n",
+        f"  Total valoare:  {data.get('total_amount', 0)} RON\n",
+    ]
     
-    if 'channels' in data and data['channels']:
-        print()
-        print("  Detalii pe canal:")
-        for ch in data['channels']:
-            if ch.get('count', 0) > 0:
-                channel = ch.get('channel', '?')
-                value = ch.get('value', 0)
-                count = ch.get('count', 0)
-                total = count * value
-                print(f"    • Canal {channel} ({value} RON): {count} buc = {total} RON")
-    
-    print("═" * 54)
-    print()
+    rows = []
+    for ch in data.get('channels') or ():
+        count = ch.get('count', 0)
+        if count > 0:
+            value = ch.get('value', 0)
+            rows.append(f"    • Canal {ch.get('channel', '?')} ({value} RON): {count} buc = {count * value} RON")
+    if rows:
+        parts.append("\n  Detalii pe canal:\n" + "\n".join(rows) + "\n")
+    
+    parts.append(STATS_BOTTOM)
+    sys.stdout.write("".join(parts))
+    sys.stdout.flush()
 
 
-def command_listener(ser):
-    """Thread pentru comenzi interactive"""
-    global running
-    
+def print_commands():
+    """Lista de comenzi afișată la pornire"""
     print("\n💡 Comenzi disponibile:")
     print("   status - Afișează statistici")
     print("   reset  - Resetează totaluri")
     print("   quit   - Ieșire")
     print()
+
+
+# Comenzi trimise la Arduino - octeți gata codificați
+STATUS_REQUEST = b'STATUS\n'
+RESET_REQUEST = b'RESET\n'
+
+# Comandă tastatură -> (octeți, mesaj)
+STATUS_COMMAND = (STATUS_REQUEST, "⏳ Solicitare statistici...")
+RESET_COMMAND = (RESET_REQUEST, "⏳ Resetare statistici...")
+ARDUINO_COMMANDS = {
+    'status': STATUS_COMMAND,
+    's': STATUS_COMMAND,
+    'reset': RESET_COMMAND,
+    'r': RESET_COMMAND,
+}
+
+
+def handle_command(cmd, ser):
+    """Execută o comandă de la tastatură; întoarce False pentru ieșire"""
+    cmd = cmd.strip().lower()
+    command = ARDUINO_COMMANDS.get(cmd)
+    
+    if command is not None:
+        payload, message = command
+        if ser and ser.is_open:
+            ser.write(payload)
+            print(message)
+        else:
+            print("⚠️  Nu e conectat la Arduino!")
+    
+    elif cmd in ('quit', 'q', 'exit'):
+        print("\n🛑 Oprire aplicație...")
+        return False
+    
+    elif cmd in ('help', 'h'):
+        print("\nComenzi:")
+        print("  status - Statistici")
+        print("  reset  - Reset")
+        print("  quit   - Ieșire")
+        print()
+    
+    elif cmd:
+        print(f"⚠️  Comandă necunoscută: '{cmd}'")
+    
+    return True
+
+
+def watch_port(ser):
+    """epoll pe portul serial (edge-triggered) și pe stdin (comenzi)"""
+    global stdin_open
+    
+    epoll = select.epoll()
+    epoll.register(ser.fileno(), select.EPOLLIN | select.EPOLLET | select.EPOLLERR | select.EPOLLHUP)
+    if stdin_open:
+        try:
+            epoll.register(STDIN_FD, select.EPOLLIN)
+        except PermissionError:
+            # stdin e un fișier obișnuit (ex. /dev/null) - doar monitorizare
+            stdin_open = False
+    return epoll
+
+
+def print_ready(data):
+    """Mesaj "ready" după reset Arduino"""
+    device = data.get('device', 'Arduino')
+    print(f"✓ {device} conectat și gata!")
+    print()
+
+
+def print_ok(data):
+    """Răspuns "ok" la o comandă - cu statistici pentru STATUS"""
+    msg = data.get('msg')
+    if msg:
+        print(f"✓ {msg}")
     
-    while running:
+    if 'total_bills' in data:
+        print_statistics(data)
+
+
+# Mesaje Arduino: (cheie, valoare) -> funcție de afișare
+MESSAGE_HANDLERS = {
+    ('status', 'ready'): print_ready,
+    ('event', 'bill_accepted'): print_bill_accepted,
+    ('status', 'ok'): print_ok,
+}
+
+
+def handle_line(line):
+    """Procesează o linie primită de la Arduino (bytes, fără '\\n')
+    
+    Întoarce mesajul JSON decodat sau None pentru text simplu.
+    """
+    # Mesajele Arduino sunt obiecte JSON - textul de debug nu trece prin
+    # parser (și nu mai costă o excepție pe linie)
+    data = None
+    if line[:1] == b'{':
         try:
-            cmd = input().strip().lower()
-            
-            if cmd in ['quit', 'q', 'exit']:
-                print("\n🛑 Oprire aplicație...")
-                running = False
-                break
-            
-            elif cmd in ['status', 's']:
-                if ser and ser.is_open:
-                    ser.write(b'STATUS\n')
-                    print("⏳ Solicitare statistici...")
-                else:
-                    print("⚠️  Nu e conectat la Arduino!")
-            
-            elif cmd in ['reset', 'r']:
-                if ser and ser.is_open:
-                    ser.write(b'RESET\n')
-                    print("⏳ Resetare statistici...")
-                else:
-                    print("⚠️  Nu e conectat la Arduino!")
-            
-            elif cmd in ['help', 'h']:
-                print("\nComenzi:")
-                print("  status - Statistici")
-                print("  reset  - Reset")
-                print("  quit   - Ieșire")
-                print()
-            
-            elif cmd:
-                print(f"⚠️  Comandă necunoscută: '{cmd}'")
-        
-        except (EOFError, KeyboardInterrupt):
-            running = False
-            break
-        except Exception as e:
-            if running:
-                print(f"❌ Eroare: {e}")
+            data = json_loads(line)
+        except ValueError:
+            pass  # Obiect trunchiat sau UTF-8 invalid
+    
+    if not isinstance(data, dict):
+        print(f"[Arduino] {line.decode('utf-8', errors='replace')}")
+        return None
+    
+    # Un singur lookup în tabela de mesaje
+    if 'event' in data:
+        key = ('event', data['event'])
+    else:
+        key = ('status', data.get('status'))
+    
+    # Doar valori text - o listă sau un obiect JSON nu poate fi cheie
+    handler = MESSAGE_HANDLERS.get(key) if isinstance(key[1], str) else None
+    
+    if handler is not None:
+        handler(data)
+    else:
+        print(f"[Info] {json_dumps(data)}")
+    
+    return data
+
+
+def signal_handler(sig, frame):
+    """Handler pentru SIGTERM - oprește loop-ul principal"""
+    shutdown_event.set()
 
 
 def main():
     """Funcția principală"""
-    global running
+    global stdin_open
+    
+    # Oprire curată și ca serviciu (systemctl stop)
+    signal.signal(signal.SIGTERM, signal_handler)
+    
+    # stdout fără flush la fiecare linie - flush explicit înainte de fiecare așteptare
+    sys.stdout.reconfigure(line_buffering=False)
     
     print_header()
     
@@ -257,73 +492,97 @@ def main():
         print("  3. Testează cu: sudo cat /dev/ttyACM0")
         sys.exit(1)
     
-    print()
-    print("═" * 54)
-    print("  ✅ SISTEM GATA!")
-    print("═" * 54)
-    print()
-    print("👉 Introdu o bancnotă în NV10...")
-    print()
+    sys.stdout.write(READY_BANNER)
     
-    # Pornește thread pentru comenzi
-    cmd_thread = threading.Thread(target=command_listener, args=(ser,), daemon=True)
-    cmd_thread.start()
+    # Comenzile sunt citite în același loop cu portul serial (fără thread separat)
+    print_commands()
     
     # Loop principal
     reconnect_attempts = 0
     max_reconnect = 3
+    epoll = None
+    ser_fd = None
+    buffer = bytearray()  # Bytes primiți după ultimul '\n'
+    commands = bytearray()  # Comandă tastată, încă fără '\n'
     
     try:
-        while running:
+        while not shutdown_event.is_set():
+            # Tot ce s-a afișat de la ultima așteptare iese într-un singur write
+            sys.stdout.flush()
+            
             try:
-                if ser and ser.is_open and ser.in_waiting > 0:
-                    line = ser.readline().decode('utf-8', errors='ignore').strip()
-                    
-                    if not line:
+                if not ser or not ser.is_open:
+                    raise serial.SerialException("Port închis")
+                
+                if epoll is None:
+                    epoll = watch_port(ser)
+                    ser_fd = ser.fileno()
+                
+                # Edge-triggered: o notificare per sosire de date, apoi golim tot
+                for fd, mask in epoll.poll(READ_WAIT):
+                    if fd == STDIN_FD:
+                        # Direct din fd - toate comenzile sosite deodată, nu
+                        # doar prima (restul ar rămâne în bufferul sys.stdin)
+                        data = os.read(STDIN_FD, READ_CHUNK)
+                        if not data:
+                            # EOF - fără tastatură, doar monitorizare
+                            stdin_open = False
+                            epoll.unregister(STDIN_FD)
+                            data = b'\n'  # Ultima comandă, chiar fără '\n'
+                        commands += data
+                        while (newline := commands.find(b'\n')) >= 0:
+                            cmd = commands[:newline].decode('utf-8', errors='replace')
+                            del commands[:newline + 1]
+                            if not handle_command(cmd, ser):
+                                shutdown_event.set()
+                                break
                         continue
                     
-                    # Reset reconnect counter on successful read
-                    reconnect_attempts = 0
-                    
-                    try:
-                        data = json.loads(line)
-                        
-                        if data.get('status') == 'ready':
-                            device = data.get('device', 'Arduino')
-                            print(f"✓ {device} conectat și gata!")
-                            print()
-                        
-                        elif data.get('event') == 'bill_accepted':
-                            print_bill_accepted(data)
-                        
-                        elif data.get('status') == 'ok':
-                            msg = data.get('msg')
-                            if msg:
-                                print(f"✓ {msg}")
-                            
-                            if 'total_bills' in data:
-                                print_statistics(data)
-                        
-                        else:
-                            print(f"[Info] {json.dumps(data)}")
-                    
-                    except json.JSONDecodeError:
-                        if line:
-                            print(f"[Arduino] {line}")
+                    if mask & (select.EPOLLHUP | select.EPOLLERR):
+                        raise serial.SerialException("Port închis")
+                    # Direct din fd, fără pyserial: un syscall per bucată de
+                    # până la READ_CHUNK octeți
+                    while True:
+                        try:
+                            chunk = os.read(ser_fd, READ_CHUNK)
+                        except BlockingIOError:
+                            break
+                        except OSError as e:
+                            # Ex. EIO de la tty - tot o conexiune pierdută
+                            raise serial.SerialException(e)
+                        if not chunk:
+                            # Gata de citire dar fără date = deconectat
+                            raise serial.SerialException("Dispozitiv deconectat")
+                        buffer += chunk
+                        if len(chunk) < READ_CHUNK:
+                            break
                 
-                elif not ser or not ser.is_open:
-                    raise serial.SerialException("Port închis")
+                while (newline := buffer.find(b'\n')) >= 0:
+                    line = bytes(buffer[:newline]).strip()
+                    del buffer[:newline + 1]
+                    if line:
+                        # Reset reconnect counter on successful read
+                        reconnect_attempts = 0
+                        handle_line(line)
+                
+                if len(buffer) > MAX_LINE:
+                    # Fără '\n' de prea mult timp (baud greșit / zgomot)
+                    buffer.clear()
                 
             except serial.SerialException as e:
                 reconnect_attempts += 1
+                buffer.clear()
+                if epoll is not None:
+                    epoll.close()
+                    epoll = None
                 print(f"\n⚠️  Conexiune pierdută: {e}")
                 
                 if reconnect_attempts >= max_reconnect:
                     print(f"❌ Prea multe încercări ({max_reconnect}), oprire...")
-                    running = False
+                    shutdown_event.set()
                     break
                 
-                print(f"🔄 Reconectare ({reconnect_attempts}/{max_reconnect})...")
+                print(f"🔄 Reconectare ({reconnect_attempts}/{max_reconnect})...", flush=True)
                 
                 if ser:
                     try:
@@ -331,7 +590,8 @@ def main():
                     except:
                         pass
                 
-                time.sleep(2)
+                if shutdown_event.wait(2):
+                    break
                 
                 # Caută din nou Arduino
                 new_port = wait_for_arduino(max_wait=10)
@@ -344,28 +604,22 @@ def main():
                         print("❌ Reconectare eșuată")
                 else:
                     print("❌ Arduino nu mai e disponibil")
-            
-            time.sleep(0.01)
     
     except KeyboardInterrupt:
         print("\n\n⚠️  Ctrl+C")
-        running = False
+        shutdown_event.set()
     
     finally:
-        print("\n" + "═" * 54)
+        print("\n" + RULE)
         print("  📊 STATISTICI FINALE")
-        print("═" * 54)
+        print(RULE)
         
         if ser and ser.is_open:
             try:
-                ser.write(b'STATUS\n')
-                time.sleep(0.5)
-                
-                if ser.in_waiting > 0:
-                    line = ser.readline().decode('utf-8', errors='ignore').strip()
-                    data = json.loads(line)
-                    print_statistics(data)
-            except:
+                # Răspunsul vine de obicei în câteva ms - nu așteptăm orbește
+                ser.write(STATUS_REQUEST)
+                wait_for_message(ser, is_statistics, FINAL_WAIT)
+            except (serial.SerialException, OSError):
                 pass
             
             ser.close()